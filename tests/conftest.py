@@ -73,13 +73,13 @@ def no_logs_gte_error(caplog):
     assert not errors, "Test failed due to presence of one or more logs with ERROR severity."
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_video_file() -> str:
     """Simple test video containing both fast cuts and fades/dissolves."""
     return check_exists("tests/resources/testvideo.mp4")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_movie_clip() -> str:
     """Movie clip containing fast cuts."""
     return check_exists("tests/resources/goldeneye.mp4")
@@ -18,10 +18,11 @@ which applies SceneDetector algorithms on VideoStream backends.
 
 # pylint: disable=invalid-name
 
-import glob
 import os
 import os.path
-from typing import List
+from typing import Iterator, List, Tuple
+
+import pytest
 
 from scenedetect._scene_loader import SceneLoader
 from scenedetect.backends.opencv import VideoStreamCv2
@@ -32,9 +33,37 @@ from scenedetect.scene_manager import SceneManager, save_images, write_scene_lis
 TEST_VIDEO_START_FRAMES_ACTUAL = [150, 180, 394]
 
 
-def test_scene_list(test_video_file):
-    """Test SceneManager get_scene_list method with VideoStreamCv2/ContentDetector."""
+def _assert_monotonic(scene_list: List[Tuple[FrameTimecode, FrameTimecode]]):
+    """Ensure each scene is non-empty and the list is sorted (i.e. end time frame of one scene is
+    equal to the start time of the next)."""
+    prev_end = None
+    for start, end in scene_list:
+        assert start.get_frames() < end.get_frames()
+        assert prev_end is None or prev_end == start
+        prev_end = end
+
+
+@pytest.fixture(scope="module")
+def shared_video(test_video_file) -> Iterator[VideoStreamCv2]:
+    """`test_video_file` opened once and shared by all tests in this module. Tests must seek to
+    the position they require before using it."""
     video = VideoStreamCv2(test_video_file)
+    yield video
+    video.capture.release()
+
+
+@pytest.fixture(scope="module")
+def shared_movie_clip(test_movie_clip) -> Iterator[VideoStreamCv2]:
+    """`test_movie_clip` opened once and shared by all tests in this module. Tests must seek to
+    the position they require before using it."""
+    video = VideoStreamCv2(test_movie_clip)
+    yield video
+    video.capture.release()
+
+
+def test_scene_list(shared_video):
+    """Test SceneManager get_scene_list method with VideoStreamCv2/ContentDetector."""
+    video = shared_video
     sm = SceneManager()
     sm.add_detector(ContentDetector())
 
@@ -56,17 +85,13 @@ def test_scene_list(test_video_file):
     # Each scene is in the format (Start Timecode, End Timecode)
     assert len(scene_list[0]) == 2
 
-    for i, _ in enumerate(scene_list):
-        assert scene_list[i][0].get_frames() < scene_list[i][1].get_frames()
-        if i > 0:
-            # Ensure frame list is sorted (i.e. end time frame of
-            # one scene is equal to the start time of the next).
-            assert scene_list[i - 1][1] == scene_list[i][0]
+    _assert_monotonic(scene_list)
 
 
-def test_get_scene_list_start_in_scene(test_video_file):
+def test_get_scene_list_start_in_scene(shared_video):
     """Test SceneManager `get_scene_list()` method with the `start_in_scene` flag."""
-    video = VideoStreamCv2(test_video_file)
+    video = shared_video
+    video.seek(0)
     sm = SceneManager()
     sm.add_detector(ContentDetector())
 
@@ -84,69 +109,60 @@ def test_get_scene_list_start_in_scene(test_video_file):
     assert scene_list[0][1] == end_time
 
 
-def test_save_images(test_video_file):
+def test_save_images(tmp_path, shared_video):
     """Test scenedetect.scene_manager.save_images function."""
-    video = VideoStreamCv2(test_video_file)
+    video = shared_video
+    video.seek(0)
     sm = SceneManager()
     sm.add_detector(ContentDetector())
 
-    image_name_glob = 'scenedetect.tempfile.*.jpg'
-    image_name_template = 'scenedetect.tempfile.$SCENE_NUMBER.$IMAGE_NUMBER'
+    image_name_template = str(tmp_path / 'scenedetect.tempfile.$SCENE_NUMBER.$IMAGE_NUMBER')
 
-    try:
-        video_fps = video.frame_rate
-        scene_list = [(FrameTimecode(start, video_fps), FrameTimecode(end, video_fps))
-                      for start, end in [(0, 100), (200, 300), (300, 400)]]
-
-        image_filenames = save_images(
-            scene_list=scene_list,
-            video=video,
-            num_images=3,
-            image_extension='jpg',
-            image_name_template=image_name_template)
+    video_fps = video.frame_rate
+    scene_list = [(FrameTimecode(start, video_fps), FrameTimecode(end, video_fps))
+                  for start, end in [(0, 100), (200, 300), (300, 400)]]
 
-        # Ensure images got created, and the proper number got created.
-        total_images = 0
-        for scene_number in image_filenames:
-            for path in image_filenames[scene_number]:
-                assert os.path.exists(path)
-                total_images += 1
+    image_filenames = save_images(
+        scene_list=scene_list,
+        video=video,
+        num_images=3,
+        image_extension='jpg',
+        image_name_template=image_name_template)
 
-        assert total_images == len(glob.glob(image_name_glob))
+    # Ensure images got created, and the proper number got created.
+    total_images = 0
+    for scene_number in image_filenames:
+        for path in image_filenames[scene_number]:
+            assert os.path.exists(path)
+            total_images += 1
 
-    finally:
-        for path in glob.glob(image_name_glob):
-            os.remove(path)
+    assert total_images == sum(1 for _ in tmp_path.iterdir())
 
 
 # TODO: Test other functionality against zero width scenes.
-def test_save_images_zero_width_scene(test_video_file):
+def test_save_images_zero_width_scene(tmp_path, shared_video):
     """Test scenedetect.scene_manager.save_images guards against zero width scenes."""
-    video = VideoStreamCv2(test_video_file)
-    image_name_glob = 'scenedetect.tempfile.*.jpg'
-    image_name_template = 'scenedetect.tempfile.$SCENE_NUMBER.$IMAGE_NUMBER'
-    try:
-        video_fps = video.frame_rate
-        scene_list = [(FrameTimecode(start, video_fps), FrameTimecode(end, video_fps))
-                      for start, end in [(0, 0), (1, 1), (2, 3)]]
-        NUM_IMAGES = 10
-        image_filenames = save_images(
-            scene_list=scene_list,
-            video=video,
-            num_images=10,
-            image_extension='jpg',
-            image_name_template=image_name_template)
-        assert len(image_filenames) == 3
-        assert all(len(image_filenames[scene]) == NUM_IMAGES for scene in image_filenames)
-        total_images = 0
-        for scene_number in image_filenames:
-            for path in image_filenames[scene_number]:
-                assert os.path.exists(path)
-                total_images += 1
-        assert total_images == len(glob.glob(image_name_glob))
-    finally:
-        for path in glob.glob(image_name_glob):
-            os.remove(path)
+    video = shared_video
+    video.seek(0)
+    image_name_template = str(tmp_path / 'scenedetect.tempfile.$SCENE_NUMBER.$IMAGE_NUMBER')
+    video_fps = video.frame_rate
+    scene_list = [(FrameTimecode(start, video_fps), FrameTimecode(end, video_fps))
+                  for start, end in [(0, 0), (1, 1), (2, 3)]]
+    NUM_IMAGES = 10
+    image_filenames = save_images(
+        scene_list=scene_list,
+        video=video,
+        num_images=10,
+        image_extension='jpg',
+        image_name_template=image_name_template)
+    assert len(image_filenames) == 3
+    assert all(len(image_filenames[scene]) == NUM_IMAGES for scene in image_filenames)
+    total_images = 0
+    for scene_number in image_filenames:
+        for path in image_filenames[scene_number]:
+            assert os.path.exists(path)
+            total_images += 1
+    assert total_images == sum(1 for _ in tmp_path.iterdir())
 
 
 # TODO: This would be more readable if the callbacks were defined within the test case, e.g.
@@ -178,12 +194,23 @@ class FakeCallback(object):
 # pylint: enable=unused-argument, unnecessary-lambda
 
 
-def test_detect_scenes_callback(test_video_file):
-    """Test SceneManager detect_scenes method with a callback function.
+@pytest.mark.parametrize("use_lambda", [True, False])
+def test_callback_shapes(use_lambda: bool):
+    """Test that both FakeCallback shapes record frame numbers, without decoding any video."""
+    fake_callback = FakeCallback()
+    callback = (
+        fake_callback.get_callback_lambda() if use_lambda else fake_callback.get_callback_func())
+    for frame_num in TEST_VIDEO_START_FRAMES_ACTUAL:
+        callback(image=None, frame_num=frame_num)
+    assert fake_callback.scene_list == TEST_VIDEO_START_FRAMES_ACTUAL
+
+
+def test_detect_scenes_callback(shared_video):
+    """Test SceneManager detect_scenes method with a callback lambda.
 
     Note that the API signature of the callback will undergo breaking changes in v1.0.
     """
-    video = VideoStreamCv2(test_video_file)
+    video = shared_video
     sm = SceneManager()
     sm.add_detector(ContentDetector())
 
@@ -201,25 +228,14 @@ def test_detect_scenes_callback(test_video_file):
     assert [start for start, end in scene_list] == TEST_VIDEO_START_FRAMES_ACTUAL
     assert fake_callback.scene_list == TEST_VIDEO_START_FRAMES_ACTUAL[1:]
 
-    # Perform same test using callback function instead of lambda.
-    sm.clear()
-    sm.add_detector(ContentDetector())
-    fake_callback = FakeCallback()
-    video.seek(start_time)
 
-    _ = sm.detect_scenes(video=video, end_time=end_time, callback=fake_callback.get_callback_func())
-    scene_list = sm.get_scene_list()
-    assert [start for start, end in scene_list] == TEST_VIDEO_START_FRAMES_ACTUAL
-    assert fake_callback.scene_list == TEST_VIDEO_START_FRAMES_ACTUAL[1:]
-
-
-def test_detect_scenes_callback_adaptive(test_video_file):
+def test_detect_scenes_callback_adaptive(shared_video):
     """Test SceneManager detect_scenes method with a callback function and a detector which
     requires frame buffering.
 
     Note that the API signature of the callback will undergo breaking changes in v1.0.
     """
-    video = VideoStreamCv2(test_video_file)
+    video = shared_video
     sm = SceneManager()
     sm.add_detector(AdaptiveDetector())
 
@@ -231,25 +247,13 @@ def test_detect_scenes_callback_adaptive(test_video_file):
     video.seek(start_time)
     sm.auto_downscale = True
 
-    _ = sm.detect_scenes(
-        video=video, end_time=end_time, callback=fake_callback.get_callback_lambda())
-    scene_list = sm.get_scene_list()
-    assert [start for start, end in scene_list] == TEST_VIDEO_START_FRAMES_ACTUAL
-    assert fake_callback.scene_list == TEST_VIDEO_START_FRAMES_ACTUAL[1:]
-
-    # Perform same test using callback function instead of lambda.
-    sm.clear()
-    sm.add_detector(AdaptiveDetector())
-    fake_callback = FakeCallback()
-    video.seek(start_time)
-
     _ = sm.detect_scenes(video=video, end_time=end_time, callback=fake_callback.get_callback_func())
     scene_list = sm.get_scene_list()
     assert [start for start, end in scene_list] == TEST_VIDEO_START_FRAMES_ACTUAL
     assert fake_callback.scene_list == TEST_VIDEO_START_FRAMES_ACTUAL[1:]
 
 
-def test_scene_loader(tmp_path, test_movie_clip):
+def test_scene_loader(tmp_path, shared_movie_clip):
     """Test `SceneLoader` loading from CSV written by `write_scene_list`."""
 
     def _detect(video, detector, start, end):
@@ -261,30 +265,26 @@ def test_scene_loader(tmp_path, test_movie_clip):
         scene_manager.detect_scenes(video=video, end_time=end)
         return scene_manager.get_scene_list()
 
-    # Generate scene list.
-    video = VideoStreamCv2(test_movie_clip)
-    scene_list = _detect(
-        video=video,
-        detector=ContentDetector(),
-        start=FrameTimecode('00:00:50', video.frame_rate),
-        end=FrameTimecode('00:01:19', video.frame_rate))
+    # Generate scene list. The window only needs to contain a few cuts for the round trip to be
+    # meaningful; `test_movie_clip` has cuts at frames 1226, 1260, and 1281 within it.
+    video = shared_movie_clip
+    start = FrameTimecode('00:00:50', video.frame_rate)
+    end = FrameTimecode('00:00:55', video.frame_rate)
+    scene_list = _detect(video=video, detector=ContentDetector(), start=start, end=end)
+    assert [scene_start.get_frames() for scene_start, _ in scene_list] == [1199, 1226, 1260, 1281]
+    expected_cuts = [scene_start.get_frames() for scene_start, _ in scene_list[1:]]
 
     # Save and see if we get the same result.
     with open(tmp_path / "scenes.csv", "w") as csv_file:
         write_scene_list(csv_file, scene_list, include_cut_list=True)
-    from_csv = _detect(
-        video=VideoStreamCv2(test_movie_clip),
-        detector=SceneLoader(tmp_path / "scenes.csv", framerate=video.frame_rate),
-        start=FrameTimecode('00:00:50', video.frame_rate),
-        end=FrameTimecode('00:01:19', video.frame_rate))
+    loader = SceneLoader(tmp_path / "scenes.csv", framerate=video.frame_rate)
+    assert loader._cut_list == expected_cuts
+    from_csv = _detect(video=video, detector=loader, start=start, end=end)
     assert from_csv == scene_list
 
-    # Test without the cut list as a header as well.
+    # Test without the cut list as a header as well. Parsing is independent of decoding, so the
+    # end-to-end check above is not repeated.
     with open(tmp_path / "scenes-nocuts.csv", "w") as csv_file:
         write_scene_list(csv_file, scene_list, include_cut_list=False)
-    from_csv = _detect(
-        video=VideoStreamCv2(test_movie_clip),
-        detector=SceneLoader(tmp_path / "scenes-nocuts.csv", framerate=video.frame_rate),
-        start=FrameTimecode('00:00:50', video.frame_rate),
-        end=FrameTimecode('00:01:19', video.frame_rate))
-    assert from_csv == scene_list
+    loader = SceneLoader(tmp_path / "scenes-nocuts.csv", framerate=video.frame_rate)
+    assert loader._cut_list == expected_cuts